@@ -4,19 +4,51 @@ Provides REST API endpoints for the frontend
 """
 
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from datetime import datetime
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 from temporal_tracker import TemporalTracker
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses with orjson"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        # datetimes and NumPy values are encoded natively; the rest falls back
+        # to Flask's default hook
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder='frontend/build', static_url_path='')
 CORS(app)  # Enable CORS for React frontend
+if orjson:
+    app.json = OrjsonProvider(app)
 
 # Initialize tracker
 tracker = TemporalTracker()
 
+# Single writer so history saves never interleave with each other
+history_writer = ThreadPoolExecutor(max_workers=1)
+
+
+def _log_save_failure(future):
+    """Report a background history save that raised; it is otherwise lost"""
+    error = future.exception()
+    if error is not None:
+        app.logger.error("Saving history failed: %s", error, exc_info=error)
+
 
 @app.route('/')
 def serve():
@@ -50,7 +82,7 @@ def analyze_text():
         return jsonify({"error": "No text provided"}), 400
     
     try:
-        # Analyze text
+        # Analyze text (repeat texts are answered from the tracker's score cache)
         authenticity_score = tracker._analyze_authenticity(text)
         style_features = tracker._extract_style_features(text)
         
@@ -72,8 +104,8 @@ def list_documents():
             "document_id": doc_id,
             "version_count": len(versions),
             "latest_version": versions[-1].version_id if versions else None,
-            "created_at": versions[0].timestamp.isoformat() if versions else None,
-            "updated_at": versions[-1].timestamp.isoformat() if versions else None
+            "created_at": versions[0].timestamp_iso if versions else None,
+            "updated_at": versions[-1].timestamp_iso if versions else None
         }
         for doc_id, versions in tracker.documents.items()
     }
@@ -95,7 +127,7 @@ def add_version(document_id: str):
         
         return jsonify({
             "version_id": snapshot.version_id,
-            "timestamp": snapshot.timestamp.isoformat(),
+            "timestamp": snapshot.timestamp_iso,
             "authenticity_score": snapshot.authenticity_score,
             "style_features": snapshot.style_features,
             "metadata": snapshot.metadata
@@ -106,21 +138,31 @@ def add_version(document_id: str):
 
 @app.route('/api/documents/<document_id>/versions', methods=['GET'])
 def get_versions(document_id: str):
-    """Get all versions of a document"""
+    """Get versions of a document, optionally paginated with ?limit=&offset="""
     versions = tracker.documents.get(document_id, [])
     
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = request.args.get('limit')
+        limit = max(int(limit), 0) if limit is not None else None
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    
+    page = versions[offset:] if limit is None else versions[offset:offset + limit]
+    
     return jsonify({
         "document_id": document_id,
+        "total": len(versions),
         "versions": [
             {
                 "version_id": v.version_id,
-                "timestamp": v.timestamp.isoformat(),
+                "timestamp": v.timestamp_iso,
                 "text": v.text,
                 "authenticity_score": v.authenticity_score,
                 "style_features": v.style_features,
                 "metadata": v.metadata
             }
-            for v in versions
+            for v in page
         ]
     })
 
@@ -148,15 +190,17 @@ def get_drift(document_id: str):
 @app.route('/api/documents/<document_id>', methods=['DELETE'])
 def delete_document(document_id: str):
     """Delete a document and all its versions"""
-    if document_id in tracker.documents:
-        del tracker.documents[document_id]
-        tracker._save_history()
+    if tracker.delete_document(document_id):
+        # Persist in the background so the request returns immediately
+        history_writer.submit(tracker._save_history).add_done_callback(_log_save_failure)
         return jsonify({"message": f"Document {document_id} deleted"}), 200
     return jsonify({"error": "Document not found"}), 404
 
 
 if __name__ == '__main__':
+    # Werkzeug dev server; production runs `gunicorn wsgi:app` (see gunicorn.conf.py)
     port = int(os.environ.get('PORT', 8000))  # Changed default to 8000
+    dev_mode = os.environ.get('FLASK_DEV') == '1'
     print(f"\n🚀 Flask server starting on http://localhost:{port}")
     print(f"📊 API available at http://localhost:{port}/api\n")
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=dev_mode, threaded=True)
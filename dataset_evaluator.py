@@ -7,15 +7,22 @@ Uses kagglehub library for dataset download
 
 import os
 import json
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, track
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import kagglehub
 except ImportError:
@@ -26,11 +33,58 @@ from temporal_tracker import TemporalTracker
 
 console = Console()
 
+# Column names (lowercased) recognised as the text and label fields
+TEXT_COLUMN_CANDIDATES = ['text', 'content', 'sentence', 'paragraph', 'document', 'article', 'message']
+LABEL_COLUMN_CANDIDATES = ['label', 'class', 'is_human', 'is_ai', 'source', 'type', 'category', 'target']
+
+# Raw label values (lowercased, stripped) that mark human vs AI text
+HUMAN_LABELS = frozenset(['human', '1', 'true', 'yes', 'h', 'real', 'original'])
+AI_LABELS = frozenset(['ai', 'llm', 'gpt', '0', 'false', 'no', 'a', 'synthetic', 'generated', 'fake'])
+# Single-lookup decoder: label string -> 1 (human) / 0 (AI)
+LABEL_MAP = {**{label: 1 for label in HUMAN_LABELS}, **{label: 0 for label in AI_LABELS}}
+
+# Rows per chunk when streaming large CSV files
+CSV_CHUNK_SIZE = 100_000
+
+# Concurrent authenticity requests during evaluation
+SCORING_WORKERS = 8
+
+# Progress bar refreshes every 128 scored texts
+PROGRESS_BATCH_MASK = 127
+
 
 class DatasetEvaluator:
     def __init__(self, tracker: TemporalTracker):
         self.tracker = tracker
-        self.results: List[Dict] = []
+        # Results are stored column-wise; see the results property for dicts
+        self._index_arr = np.empty(0, dtype=np.int64)
+        self._score_arr = np.empty(0, dtype=np.float64)
+        # Label codes: 1 = human, 0 = AI, -1 = unknown
+        self._true_arr = np.empty(0, dtype=np.int8)
+        self._pred_arr = np.empty(0, dtype=np.int8)
+        self._previews: List[str] = []
+        self._results: Optional[List[Dict]] = None
+    
+    @property
+    def results(self) -> List[Dict]:
+        """Per-text result dicts, built on first access from the result columns."""
+        if self._results is None:
+            label_names = {1: "human", 0: "ai", -1: "unknown"}
+            self._results = [
+                {
+                    "index": index,
+                    "text_preview": preview,
+                    "true_label": label_names[true],
+                    "predicted_label": label_names[pred],
+                    "authenticity_score": score,
+                    "correct": pred == true if true >= 0 else None
+                }
+                for index, preview, true, pred, score in zip(
+                    self._index_arr.tolist(), self._previews, self._true_arr.tolist(),
+                    self._pred_arr.tolist(), self._score_arr.tolist()
+                )
+            ]
+        return self._results
     
     def download_dataset(self) -> str:
         """Download the Kaggle dataset using kagglehub."""
@@ -50,8 +104,13 @@ class DatasetEvaluator:
             console.print("\n[dim]Tip: Make sure you've accepted the dataset's terms on Kaggle[/dim]")
             raise
     
-    def load_dataset(self, dataset_path: str) -> pd.DataFrame:
-        """Load the CSV file from the downloaded dataset."""
+    def load_dataset(self, dataset_path: str, sample_size: Optional[int] = None,
+                     random_state: int = 42) -> pd.DataFrame:
+        """Load the CSV file from the downloaded dataset.
+        
+        With sample_size, a uniform sample of that many rows is kept while
+        streaming, so the rest of the file is never held in memory.
+        """
         console.print(f"[cyan]Loading dataset from: {dataset_path}[/cyan]")
         
         dataset_dir = Path(dataset_path)
@@ -92,68 +151,115 @@ class DatasetEvaluator:
                 if csv_file is None:
                     raise FileNotFoundError(f"No CSV files found in {dataset_path} or subdirectories")
         
+        # Detect text/label columns from a small preview so the full read
+        # only parses the columns the evaluator actually uses
+        preview = pd.read_csv(csv_file, nrows=1000, on_bad_lines='skip', engine='python')
+        text_col, label_col = self._detect_columns(preview)
+        usecols = [col for col in (text_col, label_col) if col] or None
+        dtype = {label_col: 'category'} if label_col else None
+        
         # Load CSV with robust parsing for large files with complex text
         # Try multiple parsing strategies to handle different CSV formats
         try:
-            # Try with pandas 2.0+ syntax first (Python engine doesn't support low_memory)
-            df = pd.read_csv(
+            # Stream through the C parser in chunks to bound peak memory
+            chunks = pd.read_csv(
                 csv_file,
-                quoting=1,  # QUOTE_ALL - handle quoted fields properly
+                usecols=usecols,
+                dtype=dtype,
                 on_bad_lines='skip',  # Skip problematic lines instead of crashing
-                engine='python'  # Use Python engine for better error handling
+                engine='c',
+                chunksize=CSV_CHUNK_SIZE
             )
-        except TypeError:
-            # pandas < 2.0 uses different parameter name
+            if sample_size:
+                df = self._reservoir_sample(chunks, sample_size, random_state)
+            else:
+                df = pd.concat(chunks, ignore_index=True)
+        except Exception as e:
+            console.print(f"[yellow]Trying alternative parsing: {e}[/yellow]")
             try:
+                # Python engine is slower but more forgiving with complex text
                 df = pd.read_csv(
                     csv_file,
-                    quoting=1,
-                    error_bad_lines=False,  # Old pandas syntax
-                    warn_bad_lines=False,
+                    usecols=usecols,
+                    dtype=dtype,
+                    quoting=1,  # QUOTE_ALL - handle quoted fields properly
+                    on_bad_lines='skip',
                     engine='python'
                 )
-            except Exception as e:
-                console.print(f"[yellow]Trying basic read: {e}[/yellow]")
-                # Final fallback: basic read with chunking for large files
-                try:
-                    # Read in chunks and concatenate
-                    chunk_list = []
-                    chunk_size = 100000
-                    for chunk in pd.read_csv(csv_file, chunksize=chunk_size, engine='python', on_bad_lines='skip'):
-                        chunk_list.append(chunk)
-                    df = pd.concat(chunk_list, ignore_index=True)
-                except:
-                    # Ultimate fallback - basic read
-                    df = pd.read_csv(csv_file, engine='python')
-        except Exception as e:
-            console.print(f"[yellow]Trying alternative parsing: {e}[/yellow]")
-            # Alternative: try with chunking
-            try:
-                chunk_list = []
-                for chunk in pd.read_csv(csv_file, chunksize=100000, on_bad_lines='skip'):
-                    chunk_list.append(chunk)
-                df = pd.concat(chunk_list, ignore_index=True)
-            except:
+            except Exception:
                 # Last resort
                 df = pd.read_csv(csv_file, engine='python')
         
+        if sample_size and len(df) > sample_size:
+            df = df.sample(n=sample_size, random_state=random_state)
+        
         console.print(f"[green]✓ Loaded {len(df)} rows from {csv_file.name}[/green]")
         console.print(f"Columns: {list(df.columns)}")
         
         return df
     
+    def _reservoir_sample(self, chunks, sample_size: int, random_state: int = 42) -> pd.DataFrame:
+        """Uniformly sample sample_size rows from a stream of chunks (Algorithm R)."""
+        rng = np.random.default_rng(random_state)
+        reservoir = None
+        seen = 0
+        
+        for chunk in chunks:
+            if reservoir is None:
+                reservoir = chunk.iloc[:0]
+            
+            # Fill the reservoir before any replacement happens
+            fill = min(sample_size - len(reservoir), len(chunk))
+            if fill > 0:
+                reservoir = pd.concat([reservoir, chunk.iloc[:fill]])
+                chunk = chunk.iloc[fill:]
+                seen += fill
+            if chunk.empty:
+                continue
+            
+            # Stream row seen + j replaces a random slot with probability k / (seen + j + 1)
+            slots = rng.integers(0, seen + np.arange(1, len(chunk) + 1))
+            seen += len(chunk)
+            hits = np.flatnonzero(slots < sample_size)
+            if hits.size == 0:
+                continue
+            
+            # When several rows land on the same slot, the latest one wins
+            hits, hit_slots = hits[::-1], slots[hits][::-1]
+            _, last = np.unique(hit_slots, return_index=True)
+            keep = np.ones(len(reservoir), dtype=bool)
+            keep[hit_slots[last]] = False
+            reservoir = pd.concat([reservoir[keep], chunk.iloc[hits[last]]])
+        
+        return reservoir if reservoir is not None else pd.DataFrame()
+    
     def normalize_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize dataset to expected format."""
-        normalized = df.copy()
+        text_col, label_col = self._detect_columns(df)
+        if text_col and text_col.lower() not in TEXT_COLUMN_CANDIDATES:
+            console.print(f"[yellow]Using '{text_col}' as text column (first string column)[/yellow]")
+        
+        # Normalize labels
+        if label_col:
+            is_human = self._normalize_labels(df[label_col])
+            console.print(f"[cyan]Using label column: '{label_col}'[/cyan]")
+        else:
+            console.print("[yellow]Warning: No label column found. All texts will be analyzed but not evaluated.[/yellow]")
+            is_human = pd.Series(pd.NA, index=df.index, dtype='Int8')
         
-        # Try to identify columns
+        console.print(f"[cyan]Using text column: '{text_col if text_col else 'text'}'[/cyan]")
+        
+        # Assemble the two output columns directly instead of copying the whole frame
+        return pd.DataFrame({'text': df[text_col or 'text'], 'is_human': is_human}, index=df.index)
+    
+    def _detect_columns(self, df: pd.DataFrame) -> Tuple[Optional[str], Optional[str]]:
+        """Identify the text and label columns of a raw dataset frame."""
         text_col = None
         label_col = None
         
         # Try to find text column (case-insensitive search)
-        text_candidates = ['text', 'content', 'sentence', 'paragraph', 'document', 'article', 'message']
         for col in df.columns:
-            if col.lower() in text_candidates:
+            if col.lower() in TEXT_COLUMN_CANDIDATES:
                 text_col = col
                 break
         
@@ -162,58 +268,32 @@ class DatasetEvaluator:
             object_cols = df.select_dtypes(include=['object', 'string']).columns
             if len(object_cols) > 0:
                 text_col = object_cols[0]
-                console.print(f"[yellow]Using '{text_col}' as text column (first string column)[/yellow]")
         
         # Try to find label column (case-insensitive search)
-        label_candidates = ['label', 'class', 'is_human', 'is_ai', 'source', 'type', 'category', 'target']
         for col in df.columns:
-            if col.lower() in label_candidates:
+            if col.lower() in LABEL_COLUMN_CANDIDATES:
                 label_col = col
                 break
         
-        # Normalize labels
-        if label_col:
-            normalized['is_human'] = normalized[label_col].apply(self._normalize_label)
-            console.print(f"[cyan]Using label column: '{label_col}'[/cyan]")
-        else:
-            console.print("[yellow]Warning: No label column found. All texts will be analyzed but not evaluated.[/yellow]")
-            normalized['is_human'] = None
-        
-        # Rename text column to 'text'
-        if text_col and text_col != 'text':
-            normalized['text'] = normalized[text_col]
-        
-        console.print(f"[cyan]Using text column: '{text_col if text_col else 'text'}'[/cyan]")
-        
-        return normalized[['text', 'is_human']].copy()
+        return text_col, label_col
     
-    def _normalize_label(self, label: any) -> Optional[int]:
-        """Normalize label to binary: 1 = human, 0 = AI."""
-        if pd.isna(label):
-            return None
-        
-        label_str = str(label).lower().strip()
-        
-        # Human indicators
-        if label_str in ['human', '1', 'true', 'yes', 'h', 'real', 'original']:
-            return 1
-        # AI indicators
-        elif label_str in ['ai', 'llm', 'gpt', '0', 'false', 'no', 'a', 'synthetic', 'generated', 'fake']:
-            return 0
-        else:
-            return None
+    def _normalize_labels(self, labels: pd.Series) -> pd.Series:
+        """Normalize a label column to binary: 1 = human, 0 = AI, NA if unknown (nullable Int8)."""
+        label_str = labels.astype('string').str.lower().str.strip()
+        return label_str.map(LABEL_MAP).astype('Int8')
     
     def evaluate_on_dataset(self, df: pd.DataFrame, sample_size: Optional[int] = None, 
-                           create_versions: bool = False) -> Dict:
+                           create_versions: bool = False,
+                           max_workers: int = SCORING_WORKERS) -> Dict:
         """Evaluate the tracker on the dataset."""
         normalized_df = self.normalize_dataset(df)
         
         # Filter out rows without labels if evaluating
         has_labels = normalized_df['is_human'].notna().any()
         if has_labels:
-            evaluation_df = normalized_df[normalized_df['is_human'].notna()].copy()
+            evaluation_df = normalized_df[normalized_df['is_human'].notna()]
         else:
-            evaluation_df = normalized_df.copy()
+            evaluation_df = normalized_df
             console.print("[yellow]No labels available - running analysis only (no accuracy calculation)[/yellow]")
         
         # Sample if requested
@@ -221,54 +301,63 @@ class DatasetEvaluator:
             evaluation_df = evaluation_df.sample(n=sample_size, random_state=42)
             console.print(f"[cyan]Sampling {sample_size} rows for evaluation[/cyan]")
         
-        self.results = []
-        correct_predictions = 0
-        total_evaluated = 0
-        
         console.print(f"\n[bold]Evaluating on {len(evaluation_df)} texts...[/bold]\n")
         
-        with Progress() as progress:
+        with Progress() as progress, ThreadPoolExecutor(max_workers=max_workers) as executor:
             task = progress.add_task("[cyan]Evaluating...", total=len(evaluation_df))
             
-            for idx, row in evaluation_df.iterrows():
-                text = str(row['text'])
-                true_label = row['is_human']
-                
-                # Skip empty text
-                if not text or len(text.strip()) < 10:
-                    progress.update(task, advance=1)
-                    continue
-                
-                # Analyze text
-                authenticity_score = self.tracker._analyze_authenticity(text)
-                
-                # Predict: score > 0.5 = human, <= 0.5 = AI
-                predicted_label = 1 if authenticity_score > 0.5 else 0
-                
-                # Store result
-                result = {
-                    "index": int(idx),
-                    "text_preview": text[:100] + "..." if len(text) > 100 else text,
-                    "true_label": "human" if true_label == 1 else "ai" if true_label == 0 else "unknown",
-                    "predicted_label": "human" if predicted_label == 1 else "ai",
-                    "authenticity_score": float(authenticity_score),
-                    "correct": None
+            # Skip empty text, checked for the whole column at once
+            text_lengths = evaluation_df['text'].astype('string').str.strip().str.len()
+            scored_df = evaluation_df[(text_lengths >= 10).fillna(False).to_numpy(dtype=bool)]
+            done = len(evaluation_df) - len(scored_df)
+            
+            # Pull the raw column arrays once instead of materializing rows
+            indices = scored_df.index.to_numpy()
+            texts = [str(text) for text in scored_df['text'].to_numpy()]
+            # Label codes: 1 = human, 0 = AI, -1 = unknown
+            labels = scored_df['is_human'].astype('Int8').fillna(-1).to_numpy(dtype=np.int8)
+            
+            # Score each distinct text once; duplicates reuse it via the codes
+            codes, unique_texts = pd.factorize(pd.Series(texts, dtype=object))
+            rows_per_text = np.bincount(codes, minlength=len(unique_texts))
+            
+            # Each score is an API round-trip, so texts are scored concurrently
+            unique_scores = []
+            for code, score in enumerate(executor.map(self.tracker._analyze_authenticity, unique_texts)):
+                unique_scores.append(score)
+                done += int(rows_per_text[code])
+                # Refresh the bar in batches rather than once per text
+                if (code & PROGRESS_BATCH_MASK) == 0:
+                    progress.update(task, completed=done)
+            progress.update(task, completed=len(evaluation_df))
+            
+        # Results are filled column-wise; dicts are only built if asked for
+        self._index_arr = indices.astype(np.int64)
+        self._score_arr = np.array(unique_scores, dtype=np.float64)[codes]
+        # Predict: score > 0.5 = human, <= 0.5 = AI
+        self._pred_arr = (self._score_arr > 0.5).astype(np.int8)
+        self._true_arr = labels
+        self._previews = [text[:100] + "..." if len(text) > 100 else text for text in texts]
+        self._results = None
+        
+        labelled = labels >= 0
+        total_evaluated = int(np.count_nonzero(labelled))
+        correct_predictions = int(np.count_nonzero(labelled & (labels == self._pred_arr)))
+        
+        # Optionally create version history for temporal analysis, persisted
+        # with a single history write
+        if create_versions:
+            self.tracker.add_versions_bulk(
+                {
+                    "document_id": f"eval_doc_{idx}",
+                    "text": text,
+                    "metadata": {"source": "kaggle_dataset", "true_label": true_code if true_code >= 0 else None},
+                    "authenticity_score": score
                 }
-                
-                if true_label is not None:
-                    result["correct"] = (predicted_label == true_label)
-                    if result["correct"]:
-                        correct_predictions += 1
-                    total_evaluated += 1
-                
-                self.results.append(result)
-                
-                # Optionally create version history for temporal analysis
-                if create_versions:
-                    doc_id = f"eval_doc_{idx}"
-                    self.tracker.add_version(doc_id, text, metadata={"source": "kaggle_dataset", "true_label": true_label})
-                
-                progress.update(task, advance=1)
+                for idx, text, true_code, score in zip(
+                    self._index_arr.tolist(), texts, labels.tolist(), self._score_arr.tolist()
+                )
+            )
         
         # Calculate metrics
         accuracy = correct_predictions / total_evaluated if total_evaluated > 0 else None
@@ -277,8 +366,7 @@ class DatasetEvaluator:
             "total_texts": len(evaluation_df),
             "evaluated": total_evaluated,
             "correct": correct_predictions,
-            "accuracy": accuracy,
-            "results": self.results
+            "accuracy": accuracy
         }
         
         return metrics
@@ -331,58 +419,55 @@ class DatasetEvaluator:
             console.print(f"  F1 Score: {f1:.2%}")
         
         # Score distribution
-        human_scores = [r["authenticity_score"] for r in self.results if r.get("true_label") == "human"]
-        ai_scores = [r["authenticity_score"] for r in self.results if r.get("true_label") == "ai"]
+        human_scores = self._score_arr[self._true_arr == 1]
+        ai_scores = self._score_arr[self._true_arr == 0]
         
-        if human_scores and ai_scores:
+        if human_scores.size and ai_scores.size:
             console.print(f"\n[bold]Score Distribution:[/bold]")
-            console.print(f"  Human texts - Avg: {sum(human_scores)/len(human_scores):.3f}, "
-                         f"Min: {min(human_scores):.3f}, Max: {max(human_scores):.3f}")
-            console.print(f"  AI texts - Avg: {sum(ai_scores)/len(ai_scores):.3f}, "
-                         f"Min: {min(ai_scores):.3f}, Max: {max(ai_scores):.3f}")
+            console.print(f"  Human texts - Avg: {human_scores.mean():.3f}, "
+                         f"Min: {human_scores.min():.3f}, Max: {human_scores.max():.3f}")
+            console.print(f"  AI texts - Avg: {ai_scores.mean():.3f}, "
+                         f"Min: {ai_scores.min():.3f}, Max: {ai_scores.max():.3f}")
     
     def _calculate_confusion_matrix(self) -> Dict[str, int]:
         """Calculate confusion matrix from results."""
-        confusion = {
-            "true_human_pred_human": 0,
-            "true_human_pred_ai": 0,
-            "true_ai_pred_human": 0,
-            "true_ai_pred_ai": 0
+        mask = self._true_arr >= 0
+        # Encode each (true, pred) pair as a single bin: 2 * true + pred
+        bins = self._true_arr[mask].astype(np.intp) * 2 + self._pred_arr[mask]
+        cm = np.bincount(bins, minlength=4).reshape(2, 2)
+        
+        return {
+            "true_human_pred_human": int(cm[1, 1]),
+            "true_human_pred_ai": int(cm[1, 0]),
+            "true_ai_pred_human": int(cm[0, 1]),
+            "true_ai_pred_ai": int(cm[0, 0])
         }
-        
-        for result in self.results:
-            if result.get("correct") is None:
-                continue
-            
-            true = result["true_label"]
-            pred = result["predicted_label"]
-            
-            if true == "human" and pred == "human":
-                confusion["true_human_pred_human"] += 1
-            elif true == "human" and pred == "ai":
-                confusion["true_human_pred_ai"] += 1
-            elif true == "ai" and pred == "human":
-                confusion["true_ai_pred_human"] += 1
-            elif true == "ai" and pred == "ai":
-                confusion["true_ai_pred_ai"] += 1
-        
-        return confusion
     
     def save_results(self, output_path: str):
         """Save evaluation results to JSON file."""
+        # Labelled rows and their hits, counted from the label arrays in one pass
+        labelled = self._true_arr >= 0
+        n_evaluated = int(np.count_nonzero(labelled))
+        n_correct = int(np.count_nonzero(labelled & (self._true_arr == self._pred_arr)))
+        
         output_data = {
             "timestamp": datetime.now().isoformat(),
             "results": self.results,
             "summary": {
-                "total": len(self.results),
-                "evaluated": sum(1 for r in self.results if r.get("correct") is not None),
-                "correct": sum(1 for r in self.results if r.get("correct") == True),
-                "accuracy": sum(1 for r in self.results if r.get("correct")) / len([r for r in self.results if r.get("correct") is not None]) if any(r.get("correct") is not None for r in self.results) else None
+                "total": len(self._index_arr),
+                "evaluated": n_evaluated,
+                "correct": n_correct,
+                "accuracy": n_correct / n_evaluated if n_evaluated else None
             }
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        if orjson:
+            # Encodes straight to bytes in C, including any NumPy scalars
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(output_data, f, indent=2)
         
         console.print(f"\n[green]✓ Results saved to {output_path}[/green]")
 
@@ -425,17 +510,17 @@ def main():
             console.print("[red]No path provided[/red]")
             return
     
+    # Ask for sample size (sampling happens while the CSV streams in)
+    sample_input = input("\nEnter sample size (press Enter to use all data): ").strip()
+    sample_size = int(sample_input) if sample_input else None
+    
     # Load dataset
     try:
-        df = evaluator.load_dataset(dataset_path)
+        df = evaluator.load_dataset(dataset_path, sample_size=sample_size)
     except Exception as e:
         console.print(f"[red]Error loading dataset: {e}[/red]")
         return
     
-    # Ask for sample size
-    sample_input = input("\nEnter sample size (press Enter to use all data): ").strip()
-    sample_size = int(sample_input) if sample_input else None
-    
     # Ask if creating versions
     create_versions_input = input("\nCreate version history for temporal analysis? (y/n): ").strip().lower()
     create_versions = create_versions_input == 'y'
@@ -15,10 +15,10 @@ print(f"Path to dataset files: {path}")
 tracker = TemporalTracker()
 evaluator = DatasetEvaluator(tracker)
 
-# Load and evaluate
-df = evaluator.load_dataset(path)
+# Load a 100-text sample for quick evaluation
+df = evaluator.load_dataset(path, sample_size=100)
 
-# Sample 100 texts for quick evaluation
+# Evaluate
 metrics = evaluator.evaluate_on_dataset(df, sample_size=100)
 
 # Display results
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the Flask API
+Picked up automatically when running `gunicorn wsgi:app` from the repo root
+"""
+
+import os
+
+# Compiled numba kernels are cached here and shared by every worker
+os.environ.setdefault("NUMBA_CACHE_DIR", "/tmp/numba_cache")
+
+# gevent must patch the stdlib before the app (and its SSL clients) is preloaded
+from gevent import monkey
+monkey.patch_all()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# gevent workers keep serving other requests while one waits on OpenAI
+worker_class = "gevent"
+worker_connections = 100
+
+# The tracker holds version history in process memory and owns history.jsonl,
+# so run a single worker unless storage is moved out of process
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+# Import the app once in the master: the eagerly-typed numba kernels are
+# compiled (or loaded from NUMBA_CACHE_DIR) before workers fork
+preload_app = True
@@ -5,18 +5,28 @@ style drift detection, and timeline visualization.
 """
 
 import os
+import re
+import asyncio
+import bisect
 import json
+import hashlib
+import threading
+import time
+import string
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
 try:
-    import numpy as np
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
     from matplotlib.patches import Rectangle
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     HAS_VIZ = True
 except ImportError:
     HAS_VIZ = False
@@ -27,77 +37,236 @@ from rich.table import Table
 from rich.tree import Tree
 from dotenv import load_dotenv
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit, types
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 load_dotenv()
 
+# Defined before the client setup below, whose error path prints a warning
+console = Console()
+
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     api_key = os.getenv("OPENAI_API_KEY")
     client = OpenAI(api_key=api_key) if api_key else None
+    async_client = AsyncOpenAI(api_key=api_key) if api_key else None
 except ImportError:
     client = None
+    async_client = None
 except Exception as e:
     # Handle any OpenAI initialization errors gracefully
     console.print(f"[yellow]Warning: OpenAI client not available: {e}[/yellow]")
     client = None
+    async_client = None
+
+
+# Chat model used for authenticity scoring; part of the score cache key
+AUTH_MODEL = "gpt-4"
+
+# Optional local AI-text classifier used instead of AUTH_MODEL when set,
+# e.g. AUTHENTICITY_DETECTOR=openai-community/roberta-base-openai-detector
+DETECTOR_MODEL = os.getenv("AUTHENTICITY_DETECTOR")
+
+# Only this much of the text is sent to the model (and hashed for caching)
+AUTH_PROMPT_CHARS = 1500
+
+# Embedding model and cosine similarity above which a prior score is reused
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Concurrent OpenAI requests allowed by add_versions_async
+ASYNC_CONCURRENCY = 20
+
+# Seconds between status checks while an OpenAI batch job runs
+BATCH_POLL_SECONDS = 30
+
+# Tokenization and score-parsing patterns, compiled once
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_RE = re.compile(r'[.!?]+')
+_SCORE_RE = re.compile(r'([\d.]+)')
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+# ASCII bytes counted as punctuation by the style feature extractor
+PUNCTUATION_CHARS = ',.!?;:-'
+
+
+def _json_line(record: Dict) -> bytes:
+    """Serialize one JSONL record, newline included."""
+    if orjson:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(record) + "\n").encode('utf-8')
+
+
+# Parses str or bytes lines
+_json_loads = orjson.loads if orjson else json.loads
 
-console = Console()
 
+def _tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, as counted by the style features."""
+    return _WORD_RE.findall(text.lower())
 
-class LexicalTrie:
-    """Trie data structure for fast lexical analysis and word pattern matching."""
-    
-    def __init__(self):
-        self.root = {}
-        self.word_count = 0
-        self.unique_words = set()
-    
-    def insert(self, word: str):
-        """Insert a word into the trie."""
-        node = self.root
-        for char in word.lower():
-            if char not in node:
-                node[char] = {}
-            node = node[char]
-        if 'is_end' not in node:
-            node['is_end'] = True
-            self.word_count += 1
-        self.unique_words.add(word.lower())
-    
-    def build_from_text(self, text: str):
-        """Build trie from text efficiently."""
-        import re
-        words = re.findall(r'\b\w+\b', text.lower())
-        for word in words:
-            self.insert(word)
-        return words
-    
-    def search(self, word: str) -> bool:
-        """Search for a word in the trie - O(m) where m is word length."""
-        node = self.root
-        for char in word.lower():
-            if char not in node:
-                return False
-            node = node[char]
-        return node.get('is_end', False)
-    
-    def get_unique_count(self) -> int:
-        """Get count of unique words - O(1) lookup."""
-        return len(self.unique_words)
-    
-    def get_total_count(self) -> int:
-        """Get total word count."""
-        return self.word_count
+
+def _byte_class_table(chars: str) -> bytes:
+    """bytes.translate table mapping the given ASCII chars to 1, all else to 0."""
+    return bytes(1 if chr(b) in chars else 0 for b in range(256))
+
+
+# Translate tables for the non-numba character scan
+_PUNCT_TABLE = _byte_class_table(PUNCTUATION_CHARS)
+_UPPER_TABLE = _byte_class_table(string.ascii_uppercase)
+_WORD_TABLE = _byte_class_table(string.ascii_letters + string.digits + '_')
+
+if HAS_NUMBA:
+    # Eager signature: np.frombuffer over bytes yields a read-only uint8 view
+    _BYTES_VIEW = types.Array(types.uint8, 1, 'C', readonly=True)
+
+    @njit(types.UniTuple(types.int64, 3)(_BYTES_VIEW), cache=True, fastmath=True)
+    def _char_stats(buf):
+        """Count ASCII punctuation, uppercase and word bytes in a UTF-8 buffer.
+
+        Multi-byte UTF-8 sequences never contain bytes below 0x80, so ASCII
+        classes can be counted directly on the encoded text. Word bytes are
+        [A-Za-z0-9_], which sum to the total word length for ASCII text.
+        """
+        punct = 0
+        upper = 0
+        word = 0
+        for i in range(buf.shape[0]):
+            b = buf[i]
+            if b >= 65 and b <= 90:
+                upper += 1
+                word += 1
+            elif (b >= 97 and b <= 122) or (b >= 48 and b <= 57) or b == 95:
+                word += 1
+            elif (b == 44 or b == 46 or b == 33 or b == 63 or b == 59
+                  or b == 58 or b == 45):
+                punct += 1
+        return punct, upper, word
 
 
 @dataclass
+class VersionArrays:
+    """Column-wise view of a document's versions, in timestamp order."""
+    revision: int
+    timestamps: List[datetime]
+    auth: np.ndarray                # (N,) float64 authenticity scores
+    features: np.ndarray            # (N, K) float64 style features, NaN if missing
+    feature_keys: Dict[str, int]    # feature name -> column in features
+
+
+class TextBlobStore:
+    """Content-addressed store for version texts, zstd-compressed when available."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(exist_ok=True)
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def put(self, text_hash: str, text: str):
+        """Write a blob unless one with this hash already exists."""
+        # Check before encoding so compaction doesn't recompress the corpus
+        if (self.path / f"{text_hash}.zst").exists() or (self.path / f"{text_hash}.txt").exists():
+            return
+        if zstandard:
+            blob_path = self.path / f"{text_hash}.zst"
+            data = zstandard.ZstdCompressor(level=10).compress(text.encode('utf-8'))
+        else:
+            blob_path = self.path / f"{text_hash}.txt"
+            data = text.encode('utf-8')
+        
+        # Write then rename so a crash never leaves a partial blob
+        tmp_path = blob_path.with_name(f"{blob_path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, blob_path)
+    
+    def get(self, text_hash: str) -> str:
+        compressed = self.path / f"{text_hash}.zst"
+        if compressed.exists():
+            if not zstandard:
+                raise RuntimeError(f"zstandard is required to read blob {text_hash}")
+            return zstandard.ZstdDecompressor().decompress(compressed.read_bytes()).decode('utf-8')
+        return (self.path / f"{text_hash}.txt").read_text(encoding='utf-8')
+
+
+@dataclass(slots=True, frozen=True)
 class VersionSnapshot:
-    """Represents a version snapshot of text at a point in time."""
+    """Represents a version snapshot of text at a point in time.
+    
+    Immutable; use dataclasses.replace to derive a changed copy. The text
+    itself lives in a TextBlobStore and is read on first access.
+    """
     version_id: str
     timestamp: datetime
-    text: str
+    text_hash: str
     authenticity_score: float
     style_features: Dict[str, float]
     metadata: Dict
+    timestamp_iso: str = field(init=False, repr=False, compare=False)
+    blobs: Optional[TextBlobStore] = field(default=None, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Formatted once; API listings and history saves reuse it
+        object.__setattr__(self, "timestamp_iso", self.timestamp.isoformat())
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            # Cache-only write; the snapshot's fields are otherwise immutable
+            object.__setattr__(self, "_text", self.blobs.get(self.text_hash))
+        return self._text
+
+
+class LocalDetector:
+    """Int8-quantized ONNX AI-text classifier run on CPU.
+    
+    Requires optimum[onnxruntime]. The model is exported and quantized on
+    first use and reused from cache_dir afterwards.
+    """
+    
+    def __init__(self, model_name: str, cache_dir: Path):
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        model_dir = cache_dir / model_name.replace("/", "--")
+        if not (model_dir / "model_quantized.onnx").exists():
+            model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+        
+        self.model = ORTModelForSequenceClassification.from_pretrained(
+            model_dir, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    
+    def score(self, text: str) -> float:
+        """Probability that the text is human-written (label 1, "Real")."""
+        inputs = self.tokenizer(text[:AUTH_PROMPT_CHARS], return_tensors="np",
+                                truncation=True, max_length=512)
+        logits = np.asarray(self.model(**inputs).logits[0], dtype=np.float64)
+        probs = np.exp(logits - logits.max())
+        return float(probs[1] / probs.sum())
 
 
 class TemporalTracker:
@@ -108,100 +277,483 @@ class TemporalTracker:
         self.storage_path.mkdir(exist_ok=True)
         
         self.documents: Dict[str, List[VersionSnapshot]] = defaultdict(list)
+        self._save_lock = threading.Lock()
+        # Bumped on every change to a document; invalidates its cached arrays
+        self._revisions: Dict[str, int] = defaultdict(int)
+        self._arrays: Dict[str, VersionArrays] = {}
+        self._drift_cache: Dict[str, Tuple[VersionArrays, Dict, np.ndarray]] = {}
+        self._blobs = TextBlobStore(self.storage_path / "blobs")
+        
+        # Authenticity scores keyed by model + SHA-256 of the prompted text
+        self._auth_cache: Dict[str, float] = {}
+        self._auth_cache_lock = threading.Lock()
+        # Semantic cache for AUTH_MODEL: unit-norm prompt embeddings, their
+        # scores and the filled row count, swapped as one tuple so lock-free
+        # readers never see the arrays out of step
+        self._semantic: Tuple[np.ndarray, np.ndarray, int] = (
+            np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float64), 0
+        )
+        self._load_auth_cache()
+        
+        self._detector: Optional[LocalDetector] = None
+        if DETECTOR_MODEL:
+            try:
+                self._detector = LocalDetector(DETECTOR_MODEL, self.storage_path / "models")
+            except Exception as e:
+                console.print(f"[yellow]Local detector unavailable, using {AUTH_MODEL}: {e}[/yellow]")
+        
         self._load_history()
     
     def add_version(self, document_id: str, text: str, 
                    timestamp: Optional[datetime] = None,
-                   metadata: Optional[Dict] = None) -> VersionSnapshot:
-        """Add a new version of a document."""
+                   metadata: Optional[Dict] = None,
+                   authenticity_score: Optional[float] = None) -> VersionSnapshot:
+        """Add a new version of a document.
+        
+        Pass authenticity_score when the text was already scored to skip
+        a second LLM call.
+        """
+        snapshot = self._append_version(document_id, text, timestamp, metadata, authenticity_score)
+        self._append_history([(document_id, snapshot)])
+        return snapshot
+    
+    def add_versions_bulk(self, items: Iterable[Dict],
+                          use_batch_api: bool = False) -> List[VersionSnapshot]:
+        """Add many versions and append them to the history in one write.
+        
+        Each item holds add_version keyword arguments: document_id and text,
+        plus optional timestamp, metadata and authenticity_score. With
+        use_batch_api, unscored texts go through one OpenAI Batch job
+        (cheaper, but may take a while to complete) instead of one request each.
+        """
+        if use_batch_api:
+            items = [dict(item) for item in items]
+            unscored = [item for item in items if item.get("authenticity_score") is None]
+            scores = self._analyze_authenticity_batch([item["text"] for item in unscored])
+            for item, score in zip(unscored, scores):
+                item["authenticity_score"] = score
+        
+        entries = [(item["document_id"], self._append_version(**item)) for item in items]
+        if entries:
+            self._append_history(entries)
+        return [snapshot for _, snapshot in entries]
+    
+    async def add_versions_async(self, items: Iterable[Dict],
+                                 max_concurrency: int = ASYNC_CONCURRENCY) -> List[VersionSnapshot]:
+        """Like add_versions_bulk, but score unscored texts concurrently.
+        
+        Up to max_concurrency OpenAI requests are in flight at once; texts
+        with an exact cache hit never wait on the semaphore.
+        """
+        items = [dict(item) for item in items]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def score(text: str) -> float:
+            cached = self._auth_cache.get(self._auth_cache_key(text))
+            if cached is not None:
+                return cached
+            async with semaphore:
+                return await self._analyze_authenticity_async(text)
+        
+        unscored = [item for item in items if item.get("authenticity_score") is None]
+        unique_texts = list(dict.fromkeys(item["text"] for item in unscored))
+        scores = dict(zip(unique_texts, await asyncio.gather(*(score(t) for t in unique_texts))))
+        for item in unscored:
+            item["authenticity_score"] = scores[item["text"]]
+        
+        return self.add_versions_bulk(items)
+    
+    def delete_document(self, document_id: str) -> bool:
+        """Remove a document from memory; _save_history compacts it out of the log."""
+        if document_id not in self.documents:
+            return False
+        del self.documents[document_id]
+        self._revisions[document_id] += 1
+        self._arrays.pop(document_id, None)
+        self._drift_cache.pop(document_id, None)
+        return True
+    
+    def _append_version(self, document_id: str, text: str,
+                        timestamp: Optional[datetime] = None,
+                        metadata: Optional[Dict] = None,
+                        authenticity_score: Optional[float] = None) -> VersionSnapshot:
+        """Analyze text and insert a snapshot in memory without saving."""
         if timestamp is None:
             timestamp = datetime.now()
         
         # Analyze text
-        authenticity_score = self._analyze_authenticity(text)
-        style_features = self._extract_style_features(text)
+        if authenticity_score is None:
+            authenticity_score = self._analyze_authenticity(text)
+        # Precomputed scores often arrive as NumPy scalars
+        authenticity_score = float(authenticity_score)
         
-        version_id = f"{document_id}_v{len(self.documents[document_id]) + 1}"
+        # Re-saving unchanged text (e.g. metadata-only edits) reuses the features
+        text_hash = TextBlobStore.text_hash(text)
+        versions = self.documents[document_id]
+        previous = next((v for v in reversed(versions) if v.text_hash == text_hash), None)
+        if previous is not None:
+            style_features = dict(previous.style_features)
+        else:
+            style_features = self._extract_style_features(text)
+        
+        version_id = f"{document_id}_v{len(versions) + 1}"
         
         snapshot = VersionSnapshot(
             version_id=version_id,
             timestamp=timestamp,
-            text=text,
+            text_hash=text_hash,
             authenticity_score=authenticity_score,
             style_features=style_features,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            blobs=self._blobs,
+            _text=text
         )
         
-        self.documents[document_id].append(snapshot)
-        self.documents[document_id].sort(key=lambda v: v.timestamp)
-        
-        self._save_history()
+        # Versions stay sorted by timestamp; new ones are usually the latest
+        if not versions or snapshot.timestamp >= versions[-1].timestamp:
+            versions.append(snapshot)
+        else:
+            bisect.insort_right(versions, snapshot, key=lambda v: v.timestamp)
+        self._revisions[document_id] += 1
         
         return snapshot
     
     def _analyze_authenticity(self, text: str) -> float:
         """Analyze text authenticity using LLM."""
+        key = self._auth_cache_key(text)
+        cached = self._auth_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if self._detector is not None:
+            try:
+                score = self._detector.score(text)
+                self._store_auth_score(key, score)
+                return score
+            except Exception as e:
+                console.print(f"[yellow]Authenticity analysis failed: {e}[/yellow]")
+                return 0.5
+        
         if not client:
             # Fallback: simple heuristic
             return 0.7
         
+        # Near-duplicates (e.g. lightly edited versions) reuse a prior score
+        embedding = self._embed_for_cache(text)
+        if embedding is not None:
+            similar = self._semantic_lookup(embedding)
+            if similar is not None:
+                # Keyed only, so repeats skip the embedding call
+                self._store_auth_score(key, similar)
+                return similar
+        
+        try:
+            response = client.chat.completions.create(**self._authenticity_request(text))
+            score = self._parse_score(response.choices[0].message.content)
+            if score is not None:
+                self._store_auth_score(key, score, embedding)
+                return score
+        except Exception as e:
+            console.print(f"[yellow]Authenticity analysis failed: {e}[/yellow]")
+        
+        return 0.5  # Default
+    
+    async def _analyze_authenticity_async(self, text: str) -> float:
+        """Async counterpart of _analyze_authenticity using AsyncOpenAI."""
+        key = self._auth_cache_key(text)
+        cached = self._auth_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if self._detector is not None:
+            # Local inference releases the GIL; keep it off the event loop
+            return await asyncio.to_thread(self._analyze_authenticity, text)
+        
+        if not async_client:
+            return 0.7
+        
+        embedding = None
+        try:
+            response = await async_client.embeddings.create(model=EMBEDDING_MODEL, input=text[:AUTH_PROMPT_CHARS])
+            embedding = self._unit_embedding(response)
+        except Exception as e:
+            console.print(f"[yellow]Embedding for score cache failed: {e}[/yellow]")
+        if embedding is not None:
+            similar = self._semantic_lookup(embedding)
+            if similar is not None:
+                # Keyed only, so repeats skip the embedding call
+                self._store_auth_score(key, similar)
+                return similar
+        
+        try:
+            response = await async_client.chat.completions.create(**self._authenticity_request(text))
+            score = self._parse_score(response.choices[0].message.content)
+            if score is not None:
+                self._store_auth_score(key, score, embedding)
+                return score
+        except Exception as e:
+            console.print(f"[yellow]Authenticity analysis failed: {e}[/yellow]")
+        
+        return 0.5
+    
+    def _analyze_authenticity_batch(self, texts: List[str]) -> List[float]:
+        """Score many texts through a single OpenAI Batch API job.
+        
+        Cached texts are answered locally; anything the batch does not
+        return falls back to _analyze_authenticity.
+        """
+        keys = [self._auth_cache_key(text) for text in texts]
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in self._auth_cache:
+                pending.setdefault(key, text)
+        
+        if client and pending and self._detector is None:
+            try:
+                self._run_authenticity_batch(pending)
+            except Exception as e:
+                console.print(f"[yellow]Batch authenticity analysis failed: {e}[/yellow]")
+        
+        return [
+            self._auth_cache[key] if key in self._auth_cache else self._analyze_authenticity(text)
+            for key, text in zip(keys, texts)
+        ]
+    
+    def _run_authenticity_batch(self, pending: Dict[str, str]):
+        """Submit one batch job for the given cache keys/texts and cache its scores."""
+        keys = list(pending)
+        requests = [
+            {
+                "custom_id": f"text-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._authenticity_request(pending[key])
+            }
+            for i, key in enumerate(keys)
+        ]
+        payload = "\n".join(json.dumps(request) for request in requests).encode('utf-8')
+        
+        batch_file = client.files.create(file=("authenticity_batch.jsonl", payload), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        console.print(f"[cyan]Submitted batch {batch.id} with {len(requests)} texts[/cyan]")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(BATCH_POLL_SECONDS)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            console.print(f"[yellow]Batch {batch.id} ended with status: {batch.status}[/yellow]")
+            return
+        
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            score = self._parse_score(response["body"]["choices"][0]["message"]["content"])
+            if score is not None:
+                self._store_auth_score(keys[int(result["custom_id"].split("-")[1])], score)
+    
+    def _authenticity_request(self, text: str) -> Dict:
+        """Chat completion parameters for scoring one text."""
         prompt = f"""Analyze this text for authenticity (0-1 scale where 1 = clearly human, 0 = clearly AI):
 
-{text[:1500]}
+{text[:AUTH_PROMPT_CHARS]}
 
 Return only a single number between 0 and 1 representing authenticity score."""
         
+        return {
+            "model": AUTH_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a text authenticity classifier. Return only numeric scores."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0  # Deterministic, so cached scores match a re-score
+        }
+    
+    def _parse_score(self, content: str) -> Optional[float]:
+        """Extract a clamped [0, 1] score from a model reply."""
+        score_match = _SCORE_RE.search(content or "")
+        if score_match:
+            try:
+                score = float(score_match.group(1))
+            except ValueError:
+                return None
+            return max(0.0, min(1.0, score))  # Clamp to [0, 1]
+        return None
+    
+    def _auth_cache_key(self, text: str) -> str:
+        """Cache key for a text's authenticity score under the current model."""
+        digest = hashlib.sha256(text[:AUTH_PROMPT_CHARS].encode('utf-8')).hexdigest()
+        model = DETECTOR_MODEL if self._detector is not None else AUTH_MODEL
+        return f"{model}:{digest}"
+    
+    def _store_auth_score(self, key: str, score: float,
+                          embedding: Optional[np.ndarray] = None):
+        """Remember a scored text and append it to the on-disk cache."""
+        with self._auth_cache_lock:
+            self._auth_cache[key] = score
+            with open(self.storage_path / "auth_cache.jsonl", 'a') as f:
+                f.write(json.dumps({"key": key, "score": score}) + "\n")
+            
+            if embedding is not None:
+                self._semantic_append(embedding, score)
+    
+    def _semantic_append(self, embedding: np.ndarray, score: float):
+        """Add a semantic cache entry in memory and on disk; caller holds the lock."""
+        embeddings, scores, count = self._semantic
+        dim = embedding.shape[0]
+        if count and embeddings.shape[1] != dim:
+            return  # Embedding size changed under us; keep the existing entries
+        
+        if count == len(scores):
+            # Double the capacity so growth costs amortized O(D) per entry.
+            # Rows past count are invisible to readers, so filling them in
+            # place below is safe without copying.
+            capacity = max(64, 2 * count)
+            grown_embeddings = np.empty((capacity, dim), dtype=np.float32)
+            grown_scores = np.empty(capacity, dtype=np.float64)
+            if count:
+                grown_embeddings[:count] = embeddings[:count]
+                grown_scores[:count] = scores[:count]
+            embeddings, scores = grown_embeddings, grown_scores
+        
+        embeddings[count] = embedding
+        scores[count] = score
+        self._semantic = (embeddings, scores, count + 1)
+        
+        record = np.zeros(1, dtype=self._semantic_record_dtype(dim))
+        record["score"] = score
+        record["embedding"] = embedding
+        with open(self._semantic_cache_path(dim), 'ab') as f:
+            f.write(record.tobytes())
+    
+    @staticmethod
+    def _semantic_record_dtype(dim: int) -> np.dtype:
+        return np.dtype([("score", "<f8"), ("embedding", "<f4", (dim,))])
+    
+    def _semantic_cache_path(self, dim: int) -> Path:
+        """Append-only record file, partitioned by scoring and embedding model."""
+        return self.storage_path / f"semantic_cache__{AUTH_MODEL}__{EMBEDDING_MODEL}__{dim}.bin"
+    
+    def _embed_for_cache(self, text: str) -> Optional[np.ndarray]:
+        """Unit-norm embedding of the prompted text, or None if unavailable."""
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a text authenticity classifier. Return only numeric scores."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
+            response = client.embeddings.create(model=EMBEDDING_MODEL, input=text[:AUTH_PROMPT_CHARS])
+        except Exception as e:
+            console.print(f"[yellow]Embedding for score cache failed: {e}[/yellow]")
+            return None
+        return self._unit_embedding(response)
+    
+    @staticmethod
+    def _unit_embedding(response) -> Optional[np.ndarray]:
+        """L2-normalized float32 vector from an embeddings API response."""
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else None
+    
+    def _semantic_lookup(self, embedding: np.ndarray) -> Optional[float]:
+        """Score of the most similar cached prompt, if it clears the threshold."""
+        embeddings, scores, count = self._semantic
+        if not count or embeddings.shape[1] != embedding.shape[0]:
+            return None
+        
+        similarities = embeddings[:count] @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return float(scores[best])
+        return None
+    
+    def _load_auth_cache(self):
+        """Load cached authenticity scores from disk."""
+        file_path = self.storage_path / "auth_cache.jsonl"
+        semantic_paths = sorted(
+            self.storage_path.glob(f"semantic_cache__{AUTH_MODEL}__{EMBEDDING_MODEL}__*.bin"),
+            key=lambda p: p.stat().st_mtime
+        )
+        skipped = 0
+        try:
+            if file_path.exists():
+                with open(file_path, 'r') as f:
+                    for line_no, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = json.loads(line)
+                            self._auth_cache[entry["key"]] = entry["score"]
+                        except Exception as e:
+                            # e.g. a line cut short by a crash mid-append
+                            skipped += 1
+                            console.print(f"[yellow]Skipping authenticity cache line {line_no}: {e}[/yellow]")
             
-            import re
-            score_match = re.search(r'([\d.]+)', response.choices[0].message.content)
-            if score_match:
-                score = float(score_match.group(1))
-                return max(0.0, min(1.0, score))  # Clamp to [0, 1]
+            # Rewrite a damaged cache so new appends don't land on a partial line
+            if skipped:
+                tmp_path = file_path.with_suffix(".jsonl.tmp")
+                with open(tmp_path, 'w') as f:
+                    for key, score in self._auth_cache.items():
+                        f.write(json.dumps({"key": key, "score": score}) + "\n")
+                os.replace(tmp_path, file_path)
         except Exception as e:
-            console.print(f"[yellow]Authenticity analysis failed: {e}[/yellow]")
+            console.print(f"[yellow]Could not load authenticity cache: {e}[/yellow]")
         
-        return 0.5  # Default
+        if not semantic_paths:
+            return
+        try:
+            path = semantic_paths[-1]
+            dim = int(path.stem.rsplit("__", 1)[1])
+            dtype = self._semantic_record_dtype(dim)
+            count, torn = divmod(path.stat().st_size, dtype.itemsize)
+            if torn:
+                # Drop a record cut short by a crash mid-append so later
+                # appends stay aligned
+                with open(path, 'r+b') as f:
+                    f.truncate(count * dtype.itemsize)
+            
+            records = np.fromfile(path, dtype=dtype, count=count)
+            capacity = max(64, len(records))
+            embeddings = np.empty((capacity, dim), dtype=np.float32)
+            scores = np.empty(capacity, dtype=np.float64)
+            embeddings[:len(records)] = records["embedding"]
+            scores[:len(records)] = records["score"]
+            self._semantic = (embeddings, scores, len(records))
+        except Exception as e:
+            console.print(f"[yellow]Could not load semantic score cache: {e}[/yellow]")
     
     def _extract_style_features(self, text: str) -> Dict[str, float]:
-        """Extract style features from text using optimized Trie-based lexical analysis."""
-        import re
-        
-        # Build lexical trie for fast word processing
-        trie = LexicalTrie()
-        words = trie.build_from_text(text)
+        """Extract style features from text."""
+        words = _tokenize(text)
         
         # Optimized sentence splitting with single pass
-        sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+        sentences = [s.strip() for s in _SENT_RE.split(text) if s.strip()]
         
         word_count = len(words)
         sentence_count = len(sentences)
         char_count = len(text)
         
-        # Fast feature calculations using trie
-        unique_word_count = trie.get_unique_count()
-        
-        # Single-pass character analysis for punctuation and caps
-        punctuation_count = 0
-        caps_count = 0
-        total_word_length = 0
-        
-        for char in text:
-            if char in ',.!?;:-':
-                punctuation_count += 1
-            if char.isupper():
-                caps_count += 1
+        # Exact distinct-word count; a set beats hashed estimates here
+        unique_word_count = len(set(words))
         
-        for word in words:
-            total_word_length += len(word)
+        # ASCII classes are counted on the UTF-8 bytes (JIT kernel, or C-level
+        # bytes.translate without numba); only non-ASCII text needs Python passes
+        encoded = text.encode('utf-8')
+        if HAS_NUMBA:
+            buf = np.frombuffer(encoded, dtype=np.uint8)
+            punctuation_count, caps_count, total_word_length = _char_stats(buf)
+        else:
+            punctuation_count = encoded.translate(_PUNCT_TABLE).count(1)
+            caps_count = encoded.translate(_UPPER_TABLE).count(1)
+            total_word_length = encoded.translate(_WORD_TABLE).count(1)
+        if not text.isascii():
+            # Only the non-ASCII runs need Unicode-aware case checks
+            caps_count += sum(map(str.isupper, "".join(_NON_ASCII_RE.findall(text))))
+            total_word_length = sum(map(len, words))
         
         # Calculate features efficiently
         features = {
@@ -219,54 +771,92 @@ Return only a single number between 0 and 1 representing authenticity score."""
     
     def detect_style_drift(self, document_id: str, window_size: int = 3) -> Dict:
         """Detect style drift across versions."""
+        return self._style_drift(document_id)[0]
+    
+    def _style_drift(self, document_id: str) -> Tuple[Dict, np.ndarray]:
+        """Drift report plus per-transition total drift, cached until the document changes."""
         versions = self.documents.get(document_id, [])
         
         if len(versions) < 2:
-            return {"drift_detected": False, "drift_score": 0.0, "details": "Insufficient versions"}
+            return {"drift_detected": False, "drift_score": 0.0, "details": "Insufficient versions"}, np.zeros(0)
         
-        drifts = []
-        drift_points = []
+        # Reuse the last result while the document's cached arrays are current
+        arrays = self._version_arrays(document_id)
+        cached = self._drift_cache.get(document_id)
+        if cached is not None and cached[0] is arrays:
+            return cached[1], cached[2]
         
-        for i in range(1, len(versions)):
-            prev = versions[i-1]
-            curr = versions[i]
-            
-            # Calculate drift in each feature
-            feature_drifts = {}
-            for key in prev.style_features.keys():
-                if key in curr.style_features:
-                    drift = abs(curr.style_features[key] - prev.style_features[key])
-                    feature_drifts[key] = drift
-            
-            # Calculate overall drift score
-            drift_score = sum(feature_drifts.values()) / len(feature_drifts) if feature_drifts else 0
-            
-            # Authenticity drift
-            auth_drift = abs(curr.authenticity_score - prev.authenticity_score)
-            
-            total_drift = (drift_score + auth_drift) / 2
-            
-            if total_drift > 0.15:  # Threshold
-                drift_points.append({
-                    "from_version": prev.version_id,
-                    "to_version": curr.version_id,
-                    "timestamp": curr.timestamp,
-                    "drift_score": total_drift,
-                    "auth_drift": auth_drift,
-                    "feature_drifts": feature_drifts
-                })
-            
-            drifts.append(total_drift)
+        features, keys, auth = arrays.features, arrays.feature_keys, arrays.auth
         
-        avg_drift = sum(drifts) / len(drifts) if drifts else 0
+        # Mean absolute feature change per consecutive pair, over the keys
+        # both versions have (NaN marks a missing feature)
+        feature_deltas = np.abs(np.diff(features, axis=0))
+        present = ~np.isnan(feature_deltas)
+        counts = present.sum(axis=1)
+        sums = np.where(present, feature_deltas, 0.0).sum(axis=1)
+        drift_scores = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
         
-        return {
+        auth_drifts = np.abs(np.diff(auth))
+        total_drifts = (drift_scores + auth_drifts) / 2
+        
+        drift_points = []
+        for i in np.flatnonzero(total_drifts > 0.15):  # Threshold
+            prev, curr = versions[i], versions[i + 1]
+            drift_points.append({
+                "from_version": prev.version_id,
+                "to_version": curr.version_id,
+                "timestamp": curr.timestamp,
+                "drift_score": float(total_drifts[i]),
+                "auth_drift": float(auth_drifts[i]),
+                "feature_drifts": {
+                    key: float(feature_deltas[i, keys[key]])
+                    for key in prev.style_features if key in curr.style_features
+                }
+            })
+        
+        avg_drift = float(total_drifts.mean())
+        
+        result = {
             "drift_detected": len(drift_points) > 0,
             "drift_score": avg_drift,
             "drift_points": drift_points,
             "total_versions": len(versions),
             "significant_changes": len(drift_points)
         }
+        self._drift_cache[document_id] = (arrays, result, total_drifts)
+        return result, total_drifts
+    
+    def _version_arrays(self, document_id: str) -> VersionArrays:
+        """Cached column arrays for a document, rebuilt after it changes."""
+        versions = self.documents.get(document_id, [])
+        revision = self._revisions.get(document_id, 0)
+        arrays = self._arrays.get(document_id)
+        if arrays is not None and arrays.revision == revision and len(arrays.auth) == len(versions):
+            return arrays
+        
+        features, keys = self._feature_matrix(versions)
+        arrays = VersionArrays(
+            revision=revision,
+            timestamps=[v.timestamp for v in versions],
+            auth=np.array([v.authenticity_score for v in versions], dtype=np.float64),
+            features=features,
+            feature_keys=keys
+        )
+        self._arrays[document_id] = arrays
+        return arrays
+    
+    def _feature_matrix(self, versions: List[VersionSnapshot]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Stack style features into an (N, K) array; missing features are NaN."""
+        keys: Dict[str, int] = {}
+        for version in versions:
+            for key in version.style_features:
+                keys.setdefault(key, len(keys))
+        
+        matrix = np.full((len(versions), len(keys)), np.nan, dtype=np.float64)
+        for row, version in enumerate(versions):
+            for key, value in version.style_features.items():
+                matrix[row, keys[key]] = value
+        return matrix, keys
     
     def analyze_version_history(self, document_id: str) -> Dict:
         """Analyze version history for patterns."""
@@ -275,33 +865,42 @@ Return only a single number between 0 and 1 representing authenticity score."""
         if not versions:
             return {"error": "No versions found"}
         
-        # Calculate trends
-        authenticity_scores = [v.authenticity_score for v in versions]
-        timestamps = [v.timestamp for v in versions]
+        arrays = self._version_arrays(document_id)
+        auth = arrays.auth
+        timestamps = arrays.timestamps
         
         # Trend analysis
-        if len(authenticity_scores) > 1:
-            trend = "increasing" if authenticity_scores[-1] > authenticity_scores[0] else "decreasing"
-            trend_magnitude = abs(authenticity_scores[-1] - authenticity_scores[0])
+        if len(auth) > 1:
+            trend = "increasing" if auth[-1] > auth[0] else "decreasing"
+            trend_magnitude = float(abs(auth[-1] - auth[0]))
         else:
             trend = "stable"
             trend_magnitude = 0
         
-        # Feature evolution
-        feature_evolution = defaultdict(list)
-        for version in versions:
-            for key, value in version.style_features.items():
-                feature_evolution[key].append(value)
+        # Variance analysis, column-wise over the (N, K) feature matrix
+        matrix = arrays.features
+        complete = ~np.isnan(matrix).any(axis=0)
+        variances = matrix.var(axis=0)
+        ranges = np.ptp(matrix, axis=0)
+        changes = np.sign(matrix[-1] - matrix[0])
         
-        # Variance analysis
         variance_analysis = {}
-        for key, values in feature_evolution.items():
-            if len(values) > 1:
-                variance_analysis[key] = {
-                    "variance": float(np.var(values)) if hasattr(np, 'var') else 0,
-                    "range": max(values) - min(values),
-                    "trend": "increasing" if values[-1] > values[0] else "decreasing" if values[-1] < values[0] else "stable"
-                }
+        for key, col in arrays.feature_keys.items():
+            if complete[col]:
+                if len(matrix) < 2:
+                    continue
+                variance, value_range, change = variances[col], ranges[col], changes[col]
+            else:
+                # Only some versions have this feature
+                values = matrix[~np.isnan(matrix[:, col]), col]
+                if len(values) < 2:
+                    continue
+                variance, value_range, change = values.var(), np.ptp(values), np.sign(values[-1] - values[0])
+            variance_analysis[key] = {
+                "variance": float(variance),
+                "range": float(value_range),
+                "trend": "increasing" if change > 0 else "decreasing" if change < 0 else "stable"
+            }
         
         return {
             "document_id": document_id,
@@ -314,13 +913,14 @@ Return only a single number between 0 and 1 representing authenticity score."""
             "authenticity_trend": {
                 "direction": trend,
                 "magnitude": trend_magnitude,
-                "scores": authenticity_scores
+                "scores": auth.tolist()
             },
             "feature_evolution": variance_analysis,
             "drift_analysis": self.detect_style_drift(document_id)
         }
     
-    def visualize_timeline(self, document_id: str, save_path: Optional[str] = None):
+    def visualize_timeline(self, document_id: str, save_path: Optional[str] = None,
+                           dpi: int = 100):
         """Visualize style evolution timeline."""
         if not HAS_VIZ:
             console.print("[yellow]Matplotlib not available. Install matplotlib for visualization.[/yellow]")
@@ -332,11 +932,18 @@ Return only a single number between 0 and 1 representing authenticity score."""
             console.print("[yellow]Need at least 2 versions for timeline visualization.[/yellow]")
             return
         
-        fig, axes = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
+        if save_path:
+            # Render straight to Agg: no pyplot figure registry, nothing left open
+            fig = Figure(figsize=(14, 10))
+            FigureCanvasAgg(fig)
+            axes = fig.subplots(3, 1, sharex=True)
+        else:
+            fig, axes = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
         fig.suptitle(f'Style Evolution Timeline: {document_id}', fontsize=16, fontweight='bold')
         
-        timestamps = [v.timestamp for v in versions]
-        auth_scores = [v.authenticity_score for v in versions]
+        arrays = self._version_arrays(document_id)
+        timestamps = arrays.timestamps
+        auth_scores = arrays.auth
         
         # 1. Authenticity Score Timeline
         ax1 = axes[0]
@@ -350,11 +957,11 @@ Return only a single number between 0 and 1 representing authenticity score."""
         ax1.legend()
         
         # Mark drift points
-        drift_analysis = self.detect_style_drift(document_id)
+        drift_analysis, total_drifts = self._style_drift(document_id)
         if drift_analysis.get("drift_points"):
+            version_index = {v.version_id: i for i, v in enumerate(versions)}
             for drift_point in drift_analysis["drift_points"]:
-                drift_time = datetime.fromisoformat(drift_point["timestamp"].isoformat())
-                idx = next((i for i, v in enumerate(versions) if v.version_id == drift_point["to_version"]), None)
+                idx = version_index.get(drift_point["to_version"])
                 if idx is not None:
                     ax1.scatter([timestamps[idx]], [auth_scores[idx]], 
                               s=200, c='red', marker='*', zorder=5, label='Drift Point' if drift_point == drift_analysis["drift_points"][0] else '')
@@ -365,12 +972,10 @@ Return only a single number between 0 and 1 representing authenticity score."""
         colors = plt.cm.Set3(np.linspace(0, 1, len(feature_keys)))
         
         for i, key in enumerate(feature_keys):
-            feature_values = [v.style_features[key] for v in versions]
+            feature_values = arrays.features[:, arrays.feature_keys[key]]
             # Normalize for display
-            if max(feature_values) > 0:
-                normalized = [v / max(feature_values) for v in feature_values]
-            else:
-                normalized = feature_values
+            peak = feature_values.max()
+            normalized = feature_values / peak if peak > 0 else feature_values
             ax2.plot(timestamps, normalized, 'o-', label=key.replace('_', ' ').title(), 
                     color=colors[i], alpha=0.7, linewidth=1.5)
         
@@ -381,12 +986,8 @@ Return only a single number between 0 and 1 representing authenticity score."""
         
         # 3. Drift Score Timeline
         ax3 = axes[2]
-        drift_scores = []
-        for i in range(1, len(versions)):
-            prev = versions[i-1]
-            curr = versions[i]
-            drift = abs(curr.authenticity_score - prev.authenticity_score)
-            drift_scores.append(drift)
+        # Same per-transition drift that detect_style_drift thresholds
+        drift_scores = total_drifts
         
         # Interpolate drift scores to match timestamps
         drift_timestamps = timestamps[1:]
@@ -400,7 +1001,7 @@ Return only a single number between 0 and 1 representing authenticity score."""
         ax3.grid(True, alpha=0.3, axis='y')
         ax3.legend()
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Format x-axis
         if len(timestamps) > 1:
@@ -412,53 +1013,107 @@ Return only a single number between 0 and 1 representing authenticity score."""
                 ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         
         if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             console.print(f"[green]Saved timeline to {save_path}[/green]")
         else:
             plt.show()
     
+    def _history_record(self, document_id: str, v: VersionSnapshot) -> Dict:
+        """One history.jsonl line for a version; its text goes to the blob store."""
+        # Texts not yet read back from disk already have their blob
+        if v._text is not None:
+            self._blobs.put(v.text_hash, v._text)
+        return {
+            "document_id": document_id,
+            "version_id": v.version_id,
+            "timestamp": v.timestamp_iso,
+            "text_hash": v.text_hash,
+            "authenticity_score": v.authenticity_score,
+            "style_features": v.style_features,
+            "metadata": v.metadata
+        }
+    
+    def _append_history(self, entries: List[Tuple[str, VersionSnapshot]]):
+        """Append new versions to the history log without rewriting it."""
+        lines = b"".join(_json_line(self._history_record(doc_id, v)) for doc_id, v in entries)
+        with self._save_lock:
+            with open(self.storage_path / "history.jsonl", 'ab') as f:
+                f.write(lines)
+    
     def _save_history(self):
-        """Save version history to disk."""
-        data = {}
-        for doc_id, versions in self.documents.items():
-            data[doc_id] = [
-                {
-                    "version_id": v.version_id,
-                    "timestamp": v.timestamp.isoformat(),
-                    "text": v.text,
-                    "authenticity_score": v.authenticity_score,
-                    "style_features": v.style_features,
-                    "metadata": v.metadata
-                }
-                for v in versions
-            ]
-        
-        file_path = self.storage_path / "history.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Rewrite the history log from memory (compaction after deletes)."""
+        # Saves may run off the request thread (see app.py), so serialize them
+        with self._save_lock:
+            file_path = self.storage_path / "history.jsonl"
+            tmp_path = file_path.with_suffix(".jsonl.tmp")
+            with open(tmp_path, 'wb') as f:
+                for doc_id, versions in list(self.documents.items()):
+                    for v in versions:
+                        f.write(_json_line(self._history_record(doc_id, v)))
+            os.replace(tmp_path, file_path)
     
     def _load_history(self):
-        """Load version history from disk."""
-        file_path = self.storage_path / "history.json"
-        if file_path.exists():
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                for doc_id, versions_data in data.items():
-                    self.documents[doc_id] = [
-                        VersionSnapshot(
-                            version_id=v["version_id"],
-                            timestamp=datetime.fromisoformat(v["timestamp"]),
-                            text=v["text"],
-                            authenticity_score=v["authenticity_score"],
-                            style_features=v["style_features"],
-                            metadata=v.get("metadata", {})
-                        )
-                        for v in versions_data
-                    ]
-            except Exception as e:
-                console.print(f"[yellow]Could not load history: {e}[/yellow]")
+        """Load version history from disk, migrating a legacy history.json."""
+        file_path = self.storage_path / "history.jsonl"
+        legacy_path = self.storage_path / "history.json"
+        if not file_path.exists():
+            if legacy_path.exists():
+                self._load_legacy_history(legacy_path)
+                self._save_history()
+            return
+        
+        # A version can be logged twice if an append races a compaction;
+        # the latest line for a version id wins
+        loaded: Dict[str, Dict[str, VersionSnapshot]] = defaultdict(dict)
+        skipped = 0
+        inline_text = 0
+        try:
+            with open(file_path, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        v = _json_loads(line)
+                        loaded[v["document_id"]][v["version_id"]] = self._snapshot_from_record(v)
+                        inline_text += "text" in v
+                    except Exception as e:
+                        # e.g. a line cut short by a crash mid-append
+                        skipped += 1
+                        console.print(f"[yellow]Skipping history line {line_no}: {e}[/yellow]")
+        except Exception as e:
+            console.print(f"[yellow]Could not load history: {e}[/yellow]")
+        
+        for doc_id, versions in loaded.items():
+            self.documents[doc_id] = sorted(versions.values(), key=lambda v: v.timestamp)
+        
+        # Rewrite a damaged log so new appends don't land on a partial line,
+        # and move texts from older log lines into the blob store
+        if skipped or inline_text:
+            self._save_history()
+    
+    def _load_legacy_history(self, file_path: Path):
+        """Load the pre-JSONL history.json format."""
+        try:
+            data = _json_loads(file_path.read_bytes())
+            
+            for doc_id, versions_data in data.items():
+                self.documents[doc_id] = [self._snapshot_from_record(v) for v in versions_data]
+        except Exception as e:
+            console.print(f"[yellow]Could not load history: {e}[/yellow]")
+    
+    def _snapshot_from_record(self, v: Dict) -> VersionSnapshot:
+        """Rebuild a snapshot from a stored record; older records carry the text inline."""
+        text = v.get("text")
+        return VersionSnapshot(
+            version_id=v["version_id"],
+            timestamp=datetime.fromisoformat(v["timestamp"]),
+            text_hash=v["text_hash"] if text is None else TextBlobStore.text_hash(text),
+            authenticity_score=v["authenticity_score"],
+            style_features=v["style_features"],
+            metadata=v.get("metadata", {}),
+            blobs=self._blobs,
+            _text=text
+        )
 
 
 def main():
@@ -0,0 +1,6 @@
+"""
+WSGI entrypoint for production servers
+Run with: gunicorn wsgi:app (settings are read from gunicorn.conf.py)
+"""
+
+from app import app